@@ -59,7 +59,7 @@ class TTSInferenceEngine(ReferenceLoader, VQManager):
         # Set the random seed if provided
         if req.seed is not None:
             set_seed(req.seed)
-            logger.warning(f"set seed: {req.seed}")
+            logger.warning("set seed: {}", req.seed)
 
         # Get the symbolic tokens from the LLAMA model
         response_queue = self.send_Llama_request(req, prompt_tokens, prompt_texts)
@@ -1,4 +1,8 @@
 import io
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha256
 from pathlib import Path
 from typing import Callable, Literal, Tuple
@@ -14,7 +18,14 @@ from fish_speech.utils.file import (
     list_files,
     read_ref_text,
 )
-from fish_speech.utils.schema import ServeReferenceAudio
+from fish_speech.utils.schema import (
+    MAX_REFERENCE_ID_LENGTH,
+    REFERENCE_ID_PATTERN,
+    ServeReferenceAudio,
+)
+
+# Filesystem timestamps can be coarse, folders changed this recently are rescanned
+REFERENCE_MTIME_SETTLE_NS = 1_000_000_000
 
 
 class ReferenceLoader:
@@ -25,6 +36,8 @@ class ReferenceLoader:
         """
         self.ref_by_id: dict = {}
         self.ref_by_hash: dict = {}
+        # Valid reference ids, with the mtimes of the folders scanned to list them
+        self.ref_ids: tuple[list[tuple[str, int]], list[str]] | None = None
 
         # Make Pylance happy (attribut/method not defined...)
         self.decoder_model: DAC
@@ -49,7 +62,11 @@ class ReferenceLoader:
             ref_folder, AUDIO_EXTENSIONS, recursive=True, sort=False
         )
 
-        if use_cache == "off" or id not in self.ref_by_id:
+        # Files on disk may have been replaced since the references were encoded
+        signature = self._reference_signature(ref_folder, ref_audios)
+        cached = self.ref_by_id.get(id)
+
+        if use_cache == "off" or cached is None or cached[0] != signature:
             # If the references are not already loaded, encode them
             prompt_tokens = [
                 self.encode_reference(
@@ -63,15 +80,34 @@ class ReferenceLoader:
                 read_ref_text(str(ref_audio.with_suffix(".lab")))
                 for ref_audio in ref_audios
             ]
-            self.ref_by_id[id] = (prompt_tokens, prompt_texts)
+            self.ref_by_id[id] = (signature, prompt_tokens, prompt_texts)
 
         else:
             # Reuse already encoded references
             logger.info("Use same references")
-            prompt_tokens, prompt_texts = self.ref_by_id[id]
+            _, prompt_tokens, prompt_texts = cached
 
         return prompt_tokens, prompt_texts
 
+    @staticmethod
+    def _reference_signature(ref_folder: Path, ref_audios: list[Path]) -> tuple:
+        """
+        Fingerprint (path, mtime, size) of the reference audios and their .lab files,
+        used to detect stale entries in the id cache.
+        Paths are relative to the reference folder, so the entry survives a rename.
+        """
+        signature = []
+        for ref_audio in ref_audios:
+            for path in (ref_audio, ref_audio.with_suffix(".lab")):
+                name = str(path.relative_to(ref_folder))
+                try:
+                    stat = path.stat()
+                    signature.append((name, stat.st_mtime_ns, stat.st_size))
+                except FileNotFoundError:
+                    signature.append((name, None, None))
+
+        return tuple(sorted(signature))
+
     def load_by_hash(
         self,
         references: list[ServeReferenceAudio],
@@ -135,34 +171,109 @@ class ReferenceLoader:
         Returns:
             list[str]: List of valid reference IDs
         """
-        ref_base_path = Path("references")
-        if not ref_base_path.exists():
-            return []
+        # Other threads may clear the cache at any time, read it only once
+        cached = self.ref_ids
+        if cached is not None and self._mtimes_unchanged(cached[0]):
+            return list(cached[1])
 
-        valid_ids = []
-        for ref_dir in ref_base_path.iterdir():
-            if not ref_dir.is_dir():
-                continue
+        try:
+            mtimes = [("references", os.stat("references").st_mtime_ns)]
+            with os.scandir("references") as entries:
+                ref_dirs = [entry for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
+            return []
 
-            # Check if directory contains at least one audio file and corresponding .lab file
-            audio_files = list_files(
-                ref_dir, AUDIO_EXTENSIONS, recursive=False, sort=False
+        # Scanning is bound by filesystem latency, check the folders in parallel
+        visited = [[] for _ in ref_dirs]
+        with ThreadPoolExecutor() as executor:
+            is_valid = list(
+                executor.map(self._has_valid_pair, [d.path for d in ref_dirs], visited)
             )
-            if not audio_files:
-                continue
 
-            # Check if corresponding .lab file exists for at least one audio file
-            has_valid_pair = False
-            for audio_file in audio_files:
-                lab_file = audio_file.with_suffix(".lab")
-                if lab_file.exists():
-                    has_valid_pair = True
-                    break
+        valid_ids = [d.name for d, valid in zip(ref_dirs, is_valid) if valid]
+        valid_ids.sort()
+
+        # Files added in the same clock tick as the scan would not change the mtimes,
+        # only cache listings of folders that have settled
+        mtimes += [mtime for dir_mtimes in visited for mtime in dir_mtimes]
+        settled = time.time_ns() - REFERENCE_MTIME_SETTLE_NS
+        if all(mtime < settled for _, mtime in mtimes):
+            self.ref_ids = (mtimes, valid_ids)
+        else:
+            self.ref_ids = None
 
-            if has_valid_pair:
-                valid_ids.append(ref_dir.name)
+        return list(valid_ids)
 
-        return sorted(valid_ids)
+    @staticmethod
+    def _mtimes_unchanged(mtimes: list[tuple[str, int]]) -> bool:
+        try:
+            return all(os.stat(path).st_mtime_ns == mtime for path, mtime in mtimes)
+        except OSError:
+            return False
+
+    @classmethod
+    def _has_valid_pair(cls, path: str, visited: list[tuple[str, int]]) -> bool:
+        """
+        Check if a directory (or one of its subdirectories) contains
+        at least one audio file with a corresponding .lab file.
+        The mtime of every scanned directory is appended to `visited`,
+        any change in them can change the result.
+        A directory that can't be read (removed, no permission) is not valid,
+        and is recorded with an mtime that never matches so it is rescanned.
+        Symlinked subdirectories are not followed.
+        """
+        file_names, sub_dirs = set(), []
+        try:
+            visited.append((path, os.stat(path).st_mtime_ns))
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.path)
+                    else:
+                        file_names.add(entry.name)
+        except OSError:
+            visited.append((path, -1))
+            return False
+
+        for name in file_names:
+            stem, ext = os.path.splitext(name)
+            if ext in AUDIO_EXTENSIONS and f"{stem}.lab" in file_names:
+                return True
+
+        return any(cls._has_valid_pair(sub_dir, visited) for sub_dir in sub_dirs)
+
+    @staticmethod
+    def reference_dir(id: str) -> Path:
+        """
+        Get the folder of an existing reference ID.
+        Any folder name is accepted, as long as it stays inside the references folder.
+
+        Raises:
+            ValueError: If the reference ID points outside of the references folder
+        """
+        refs_base = Path("references")
+        if (refs_base / id).resolve().parent != refs_base.resolve():
+            raise ValueError(f"Invalid reference ID: '{id}'")
+
+        return refs_base / id
+
+    @staticmethod
+    def validate_reference_id(id: str) -> None:
+        """
+        Check that a reference ID is a valid directory name.
+
+        Raises:
+            ValueError: If the reference ID contains invalid characters or is too long
+        """
+        if not REFERENCE_ID_PATTERN.fullmatch(id):
+            raise ValueError(
+                "Reference ID contains invalid characters. Only alphanumeric, hyphens, underscores, and spaces are allowed."
+            )
+
+        if len(id) > MAX_REFERENCE_ID_LENGTH:
+            raise ValueError(
+                f"Reference ID is too long. Maximum length is {MAX_REFERENCE_ID_LENGTH} characters."
+            )
 
     def add_reference(self, id: str, wav_file_path: str, reference_text: str) -> None:
         """
@@ -178,23 +289,7 @@ class ReferenceLoader:
             FileNotFoundError: If the audio file doesn't exist
             OSError: If file operations fail
         """
-        # Validate ID format
-        import re
-
-        if not re.match(r"^[a-zA-Z0-9\-_ ]+$", id):
-            raise ValueError(
-                "Reference ID contains invalid characters. Only alphanumeric, hyphens, underscores, and spaces are allowed."
-            )
-
-        if len(id) > 255:
-            raise ValueError(
-                "Reference ID is too long. Maximum length is 255 characters."
-            )
-
-        # Check if reference already exists
-        ref_dir = Path("references") / id
-        if ref_dir.exists():
-            raise FileExistsError(f"Reference ID '{id}' already exists")
+        self.validate_reference_id(id)
 
         # Check if audio file exists
         audio_path = Path(wav_file_path)
@@ -207,16 +302,18 @@ class ReferenceLoader:
                 f"Unsupported audio format: {audio_path.suffix}. Supported formats: {', '.join(AUDIO_EXTENSIONS)}"
             )
 
+        # Create reference directory, this fails if the reference already exists
+        ref_dir = Path("references") / id
         try:
-            # Create reference directory
             ref_dir.mkdir(parents=True, exist_ok=False)
+        except FileExistsError:
+            raise FileExistsError(f"Reference ID '{id}' already exists")
 
+        try:
             # Determine the target audio filename with original extension
             target_audio_path = ref_dir / f"sample{audio_path.suffix}"
 
             # Copy audio file
-            import shutil
-
             shutil.copy2(audio_path, target_audio_path)
 
             # Create .lab file
@@ -227,14 +324,13 @@ class ReferenceLoader:
             # Clear cache for this ID if it exists
             if id in self.ref_by_id:
                 del self.ref_by_id[id]
+            self.ref_ids = None
 
             logger.info(f"Successfully added reference voice with ID: {id}")
 
         except Exception as e:
             # Clean up on failure
             if ref_dir.exists():
-                import shutil
-
                 shutil.rmtree(ref_dir)
             raise e
 
@@ -247,22 +343,22 @@ class ReferenceLoader:
 
         Raises:
             FileNotFoundError: If the reference ID doesn't exist
+            ValueError: If the reference ID points outside of the references folder
             OSError: If file operations fail
         """
         # Check if reference exists
-        ref_dir = Path("references") / id
+        ref_dir = self.reference_dir(id)
         if not ref_dir.exists():
             raise FileNotFoundError(f"Reference ID '{id}' does not exist")
 
         try:
             # Remove the entire reference directory
-            import shutil
-
             shutil.rmtree(ref_dir)
 
             # Clear cache for this ID if it exists
             if id in self.ref_by_id:
                 del self.ref_by_id[id]
+            self.ref_ids = None
 
             logger.info(f"Successfully deleted reference voice with ID: {id}")
 
@@ -1,6 +1,7 @@
 import io
 import wave
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Literal, Optional, Tuple
 
 import numpy as np
@@ -13,6 +14,7 @@ class InferenceResult:
     error: Optional[Exception]
 
 
+@lru_cache(maxsize=32)
 def wav_chunk_header(
     sample_rate: int = 44100, bit_depth: int = 16, channels: int = 1
 ) -> bytes:
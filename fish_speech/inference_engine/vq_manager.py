@@ -17,7 +17,7 @@ class VQManager:
         feature_lengths = torch.tensor(
             [codes.shape[1]], device=self.decoder_model.device
         )
-        logger.info(f"VQ features: {codes.shape}")
+        logger.info("VQ features: {}", codes.shape)
 
         if isinstance(self.decoder_model, DAC):
             return self.decoder_model.decode(
@@ -43,13 +43,13 @@ class VQManager:
                 [audios.shape[2]], device=self.decoder_model.device, dtype=torch.long
             )
             logger.info(
-                f"Loaded audio with {audios.shape[2] / sample_rate:.2f} seconds"
+                "Loaded audio with {:.2f} seconds", audios.shape[2] / sample_rate
             )
 
             # VQ Encoder
             if isinstance(self.decoder_model, DAC):
                 prompt_tokens = self.decoder_model.encode(audios, audio_lengths)[0][0]
-                logger.info(f"Encoded prompt: {prompt_tokens.shape}")
+                logger.info("Encoded prompt: {}", prompt_tokens.shape)
             else:
                 raise ValueError(f"Unknown model type: {type(self.decoder_model)}")
         else:
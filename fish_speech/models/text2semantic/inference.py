@@ -182,8 +182,8 @@ def decode_n_tokens(
     temperature: torch.Tensor,
     top_p: torch.Tensor,
     repetition_penalty: torch.Tensor,
-    audio_masks: torch.Tensor,
-    audio_parts: torch.Tensor,
+    audio_masks: Optional[torch.Tensor],
+    audio_parts: Optional[torch.Tensor],
     decode_one_token=decode_one_token_ar,
 ):
     previous_tokens = torch.zeros(
@@ -329,6 +329,9 @@ def generate(
     # Recreate input_pos
     input_pos = torch.tensor([T], device=device, dtype=torch.int)
 
+    # Audio parts only exist in the prompt, leave them out of the decode steps
+    # so every input has a fixed shape and the captured CUDA graph is reused
+    # across prompts of different lengths
     x = decode_n_tokens(
         model,
         first_token.view(1, codebook_dim, -1),
@@ -337,8 +340,8 @@ def generate(
         temperature=temperature,
         top_p=top_p,
         repetition_penalty=repetition_penalty,
-        audio_masks=audio_masks,
-        audio_parts=audio_parts,
+        audio_masks=None,
+        audio_parts=None,
         decode_one_token=decode_one_token,
     )
     seq = seq[:, : T + 1 + x.size(1)]
@@ -350,9 +353,19 @@ def generate(
     return seq
 
 
-def init_model(checkpoint_path, device, precision, compile=False):
+def init_model(checkpoint_path, device, precision, compile=False, int8=False):
     model = DualARTransformer.from_pretrained(checkpoint_path, load_weights=True)
 
+    if int8 and "int8" not in str(Path(checkpoint_path)):
+        # Decoding is bound by weight bandwidth, int8 weights halve it
+        from tools.llama.quantize import WeightOnlyInt8QuantHandler
+
+        quantizer = WeightOnlyInt8QuantHandler(model)
+        state_dict = quantizer.create_quantized_state_dict()
+        model = quantizer.convert_for_runtime()
+        model.load_state_dict(state_dict)
+        logger.info("Using int8 weight-only quantization!")
+
     model = model.to(device=device, dtype=precision)
     logger.info(f"Restored model from checkpoint")
 
@@ -378,6 +391,7 @@ def init_model(checkpoint_path, device, precision, compile=False):
             backend="inductor" if torch.cuda.is_available() else "aot_eager",
             mode="reduce-overhead" if torch.cuda.is_available() else None,
             fullgraph=True,
+            dynamic=False,
         )
 
     return model.eval(), decode_one_token
@@ -454,7 +468,7 @@ def generate_long(
         raise ValueError(f"Prompt is too long: {encoded.size(1)} > {max_length - 2048}")
 
     encoded = encoded.to(device=device)
-    logger.info(f"Encoded text: {text}")
+    logger.info("Encoded text: {}", text)
 
     for sample_idx in range(num_samples):
         if torch.cuda.is_available():
@@ -479,7 +493,7 @@ def generate_long(
         )
 
         if sample_idx == 0 and seg_idx == 0 and compile:
-            logger.info(f"Compilation time: {time.perf_counter() - t0:.2f} seconds")
+            logger.info("Compilation time: {:.2f} seconds", time.perf_counter() - t0)
 
         if torch.cuda.is_available():
             torch.cuda.synchronize()
@@ -489,13 +503,18 @@ def generate_long(
         tokens_generated = y.size(1) - prompt_length
         tokens_sec = tokens_generated / t
         logger.info(
-            f"Generated {tokens_generated} tokens in {t:.02f} seconds, {tokens_sec:.02f} tokens/sec"
+            "Generated {} tokens in {:.02f} seconds, {:.02f} tokens/sec",
+            tokens_generated,
+            t,
+            tokens_sec,
         )
-        logger.info(f"Bandwidth achieved: {model_size * tokens_sec / 1e9:.02f} GB/s")
+        logger.info("Bandwidth achieved: {:.02f} GB/s", model_size * tokens_sec / 1e9)
 
         if torch.cuda.is_available():
-            logger.info(
-                f"GPU Memory used: {torch.cuda.max_memory_reserved() / 1e9:.02f} GB"
+            # Lazy, so the allocator is only queried when the message is emitted
+            logger.opt(lazy=True).info(
+                "GPU Memory used: {:.02f} GB",
+                lambda: torch.cuda.max_memory_reserved() / 1e9,
             )
 
         # Put the generated tokens
@@ -532,13 +551,14 @@ def launch_thread_safe_queue(
     device,
     precision,
     compile: bool = False,
+    int8: bool = False,
 ):
     input_queue = queue.Queue()
     init_event = threading.Event()
 
     def worker():
         model, decode_one_token = init_model(
-            checkpoint_path, device, precision, compile=compile
+            checkpoint_path, device, precision, compile=compile, int8=int8
         )
         with torch.device(device):
             model.setup_caches(
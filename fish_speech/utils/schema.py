@@ -1,6 +1,6 @@
-import base64
 import os
 import queue
+import re
 from dataclasses import dataclass
 from typing import Literal
 
@@ -11,6 +11,16 @@ from typing_extensions import Annotated
 
 from fish_speech.content_sequence import TextPart, VQPart
 
+try:
+    # SIMD accelerated base64, falls back to the standard library
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# Reference IDs are used as directory names under "references"
+REFERENCE_ID_PATTERN = re.compile(r"[a-zA-Z0-9\-_ ]+")
+MAX_REFERENCE_ID_LENGTH = 255
+
 
 class ServeVQPart(BaseModel):
     type: Literal["vq"] = "vq"
@@ -68,7 +78,7 @@ class ServeReferenceAudio(BaseModel):
             isinstance(audio, str) and len(audio) > 255
         ):  # Check if audio is a string (Base64)
             try:
-                values["audio"] = base64.b64decode(audio)
+                values["audio"] = base64.b64decode(audio, validate=False)
             except Exception:
                 # If the audio is not a valid base64 string, we will just ignore it and let the server handle it
                 pass
@@ -106,7 +116,12 @@ class ServeTTSRequest(BaseModel):
 
 
 class AddReferenceRequest(BaseModel):
-    id: str = Field(..., min_length=1, max_length=255, pattern=r"^[a-zA-Z0-9\-_ ]+$")
+    id: str = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_REFERENCE_ID_LENGTH,
+        pattern=f"^{REFERENCE_ID_PATTERN.pattern}$",
+    )
     audio: bytes
     text: str = Field(..., min_length=1)
 
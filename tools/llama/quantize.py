@@ -13,7 +13,7 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
-from fish_speech.models.text2semantic.inference import load_model
+from fish_speech.models.text2semantic.inference import init_model as load_model
 from fish_speech.models.text2semantic.llama import find_multiple
 
 ##### Quantization Primitives ######
@@ -181,7 +181,9 @@ def replace_linear_weight_only_int8_per_channel(module):
             setattr(
                 module,
                 name,
-                WeightOnlyInt8Linear(child.in_features, child.out_features),
+                WeightOnlyInt8Linear(
+                    child.in_features, child.out_features, bias=child.bias is not None
+                ),
             )
         else:
             replace_linear_weight_only_int8_per_channel(child)
@@ -231,9 +233,17 @@ class WeightOnlyInt8Linear(torch.nn.Module):
             "weight", torch.empty((out_features, in_features), dtype=torch.int8)
         )
         self.register_buffer("scales", torch.ones(out_features, dtype=torch.bfloat16))
+        # The bias is kept in floating point, only the weight is quantized
+        self.register_buffer(
+            "bias",
+            torch.zeros(out_features, dtype=torch.bfloat16) if bias else None,
+        )
 
     def forward(self, input: torch.Tensor) -> torch.Tensor:
-        return F.linear(input, self.weight.to(dtype=input.dtype)) * self.scales
+        output = F.linear(input, self.weight.to(dtype=input.dtype)) * self.scales
+        if self.bias is not None:
+            output = output + self.bias
+        return output
 
 
 ##### weight only int4 per channel groupwise quantized code ######
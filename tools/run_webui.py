@@ -35,6 +35,7 @@ def parse_args():
     parser.add_argument("--device", type=str, default="cuda")
     parser.add_argument("--half", action="store_true")
     parser.add_argument("--compile", action="store_true")
+    parser.add_argument("--int8", action="store_true")
     parser.add_argument("--max-gradio-length", type=int, default=0)
     parser.add_argument("--theme", type=str, default="light")
 
@@ -62,6 +63,7 @@ if __name__ == "__main__":
         device=args.device,
         precision=args.precision,
         compile=args.compile,
+        int8=args.int8,
     )
 
     logger.info("Loading VQ-GAN model...")
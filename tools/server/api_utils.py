@@ -1,7 +1,10 @@
+import struct
 from argparse import ArgumentParser
 from http import HTTPStatus
+from types import MappingProxyType
 from typing import Annotated, Any
 
+import numpy as np
 import ormsgpack
 from baize.datastructures import ContentType
 from kui.asgi import (
@@ -16,6 +19,18 @@ from pydantic import BaseModel
 from fish_speech.inference_engine import TTSInferenceEngine
 from fish_speech.utils.schema import ServeTTSRequest
 from tools.server.inference import inference_wrapper as inference
+from tools.server.inference import to_pcm16
+
+RESPONSE_CHUNK_SIZE = 64 * 1024
+WAV_HEADER_SIZE = 44
+
+CONTENT_TYPES = MappingProxyType(
+    {
+        "wav": "audio/wav",
+        "flac": "audio/flac",
+        "mp3": "audio/mpeg",
+    }
+)
 
 
 def parse_args():
@@ -35,6 +50,7 @@ def parse_args():
     parser.add_argument("--device", type=str, default="cuda")
     parser.add_argument("--half", action="store_true")
     parser.add_argument("--compile", action="store_true")
+    parser.add_argument("--int8", action="store_true")
     parser.add_argument("--max-text-length", type=int, default=0)
     parser.add_argument("--listen", type=str, default="127.0.0.1:8080")
     parser.add_argument("--workers", type=int, default=1)
@@ -76,19 +92,48 @@ async def inference_async(req: ServeTTSRequest, engine: TTSInferenceEngine):
             yield chunk
 
 
-async def buffer_to_async_generator(buffer):
-    yield buffer
+async def buffer_to_async_generator(buffer, chunk_size=RESPONSE_CHUNK_SIZE):
+    # Send large bodies in chunks instead of a single huge write
+    view = memoryview(buffer)
+    for i in range(0, len(view), chunk_size):
+        yield bytes(view[i : i + chunk_size])
+
+
+def encode_wav(audio: np.ndarray, sample_rate: int) -> bytearray:
+    """
+    Encode mono float audio as a 16-bit PCM WAV file.
+    The output is allocated once at its final size,
+    and the samples are scaled directly into it after the header.
+    """
+    data_size = audio.shape[0] * 2
+    wav = bytearray(WAV_HEADER_SIZE + data_size)
+    struct.pack_into(
+        "<4sI4s4sIHHIIHH4sI",
+        wav,
+        0,
+        b"RIFF",
+        WAV_HEADER_SIZE - 8 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        1,  # channels
+        sample_rate,
+        sample_rate * 2,  # byte rate
+        2,  # block align
+        16,  # bits per sample
+        b"data",
+        data_size,
+    )
+
+    # Same conversion as the streaming path
+    to_pcm16(audio, out=np.frombuffer(wav, dtype=np.int16, offset=WAV_HEADER_SIZE))
+
+    return wav
 
 
 def get_content_type(audio_format):
-    if audio_format == "wav":
-        return "audio/wav"
-    elif audio_format == "flac":
-        return "audio/flac"
-    elif audio_format == "mp3":
-        return "audio/mpeg"
-    else:
-        return "application/octet-stream"
+    return CONTENT_TYPES.get(audio_format, "application/octet-stream")
 
 
 def wants_json(req):
@@ -129,8 +174,11 @@ def format_response(response: BaseModel, status_code=200):
     """
     try:
         if wants_json(request):
-            return JSONResponse(
-                response.model_dump(mode="json"), status_code=status_code
+            # Serialized by pydantic-core directly, without the stdlib json encoder
+            return (
+                response.model_dump_json().encode(),
+                status_code,
+                {"Content-Type": "application/json"},
             )
 
         return (
@@ -7,6 +7,38 @@ from fish_speech.inference_engine import TTSInferenceEngine
 from fish_speech.utils.schema import ServeTTSRequest
 
 AMPLITUDE = 32768  # Needs an explaination
+PCM16_CHUNK_SIZE = 64 * 1024
+
+
+def to_pcm16(audio: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Scale float audio to int16 PCM, saturating samples outside [-1, 1)
+    instead of letting them wrap around.
+    Works in fixed-size chunks, so no full-size float copy is materialized.
+    Writes into `out` (an int16 array of the same shape) when given.
+    """
+    if out is None:
+        out = np.empty(audio.shape, dtype=np.int16)
+
+    flat_audio, flat_out = audio.reshape(-1), out.reshape(-1)
+    buffer = np.empty(
+        min(flat_audio.size, PCM16_CHUNK_SIZE),
+        dtype=np.result_type(audio.dtype, np.float32),
+    )
+    for start in range(0, flat_audio.size, PCM16_CHUNK_SIZE):
+        chunk = flat_audio[start : start + PCM16_CHUNK_SIZE]
+        # Clip at float32 precision or better, in float16 the upper bound rounds to 1
+        clipped = buffer[: chunk.size]
+        clipped[:] = chunk
+        np.clip(clipped, -1, (AMPLITUDE - 1) / AMPLITUDE, out=clipped)
+        np.multiply(
+            clipped,
+            AMPLITUDE,
+            out=flat_out[start : start + chunk.size],
+            casting="unsafe",
+        )
+
+    return out
 
 
 def inference_wrapper(req: ServeTTSRequest, engine: TTSInferenceEngine):
@@ -30,7 +62,7 @@ def inference_wrapper(req: ServeTTSRequest, engine: TTSInferenceEngine):
             case "segment":
                 count += 1
                 if isinstance(result.audio, tuple):
-                    yield (result.audio[1] * AMPLITUDE).astype(np.int16).tobytes()
+                    yield to_pcm16(result.audio[1]).tobytes()
 
             case "final":
                 count += 1
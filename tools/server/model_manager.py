@@ -1,3 +1,5 @@
+from functools import partial
+
 import torch
 from loguru import logger
 
@@ -6,6 +8,11 @@ from fish_speech.models.dac.inference import load_model as load_decoder_model
 from fish_speech.models.text2semantic.inference import launch_thread_safe_queue
 from fish_speech.utils.schema import ServeTTSRequest
 from tools.server.inference import inference_wrapper as inference
+from tools.server.model_utils import (
+    DynamicBatcher,
+    batch_vqgan_decode,
+    feature_shape_key,
+)
 
 
 class ModelManager:
@@ -18,12 +25,14 @@ class ModelManager:
         llama_checkpoint_path: str,
         decoder_checkpoint_path: str,
         decoder_config_name: str,
+        int8: bool = False,
     ) -> None:
 
         self.mode = mode
         self.device = device
         self.half = half
         self.compile = compile
+        self.int8 = int8
 
         self.precision = torch.half if half else torch.bfloat16
 
@@ -37,11 +46,20 @@ class ModelManager:
 
         # Load the TTS models
         self.load_llama_model(
-            llama_checkpoint_path, self.device, self.precision, self.compile, self.mode
+            llama_checkpoint_path,
+            self.device,
+            self.precision,
+            self.compile,
+            self.mode,
+            self.int8,
         )
         self.load_decoder_model(
             decoder_config_name, decoder_checkpoint_path, self.device
         )
+        # Merge concurrent decode requests into a single decoder forward
+        self.decode_batcher = DynamicBatcher(
+            partial(batch_vqgan_decode, self.decoder_model), key=feature_shape_key
+        )
         self.tts_inference_engine = TTSInferenceEngine(
             llama_queue=self.llama_queue,
             decoder_model=self.decoder_model,
@@ -54,7 +72,7 @@ class ModelManager:
             self.warm_up(self.tts_inference_engine)
 
     def load_llama_model(
-        self, checkpoint_path, device, precision, compile, mode
+        self, checkpoint_path, device, precision, compile, mode, int8=False
     ) -> None:
 
         if mode == "tts":
@@ -63,6 +81,7 @@ class ModelManager:
                 device=device,
                 precision=precision,
                 compile=compile,
+                int8=int8,
             )
         else:
             raise ValueError(f"Invalid mode: {mode}")
@@ -1,5 +1,7 @@
+import asyncio
 import io
 import re
+from typing import Any, Callable, Hashable
 
 import librosa
 import torch
@@ -84,3 +86,101 @@ def batch_vqgan_decode(model, features):
     audios, audio_lengths = audios.cpu(), audio_lengths.cpu()
 
     return [audio[..., :length].numpy() for audio, length in zip(audios, audio_lengths)]
+
+
+def feature_shape_key(features: list[torch.Tensor]) -> frozenset:
+    """
+    Batching key for VQ features, only features that differ
+    in their last (time) dimension can be padded and stacked together.
+    """
+    return frozenset(tuple(feature.shape[:-1]) for feature in features)
+
+
+class DynamicBatcher:
+    """
+    Coalesce concurrent requests to a batched function.
+    Requests queued while a batch is running are merged into the next call,
+    grouped by key so only compatible requests share a batch,
+    and the results are split back to each caller in order.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list], list],
+        key: Callable[[list], Hashable] = lambda items: None,
+        max_batch_size: int = MICRO_BATCH_SIZE,
+    ) -> None:
+        self.batch_fn = batch_fn
+        self.key = key
+        self.max_batch_size = max_batch_size
+        self.queue: asyncio.Queue | None = None
+        self.task: asyncio.Task | None = None
+
+    async def submit(self, items: list) -> list:
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+
+        # (Re)start the batching loop lazily, inside the running event loop
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.batch_loop())
+
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((items, future))
+        return await future
+
+    async def batch_loop(self) -> None:
+        while True:
+            # Take everything queued so far, a lone request is run without waiting
+            pending: list[tuple[list, asyncio.Future]] = [await self.queue.get()]
+            while not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+
+            try:
+                for batch in self.make_batches(pending):
+                    await self.run_batch(batch)
+            except BaseException:
+                # Never leave callers waiting if the loop dies
+                for _, future in pending:
+                    future.cancel()
+                raise
+
+    def make_batches(self, pending: list) -> list[list]:
+        groups: dict[Hashable, list] = {}
+        for items, future in pending:
+            # Skip callers that went away
+            if not future.done():
+                groups.setdefault(self.key(items), []).append((items, future))
+
+        batches = []
+        for group in groups.values():
+            batch, size = [], 0
+            for items, future in group:
+                if batch and size + len(items) > self.max_batch_size:
+                    batches.append(batch)
+                    batch, size = [], 0
+                batch.append((items, future))
+                size += len(items)
+            batches.append(batch)
+
+        return batches
+
+    async def run_batch(self, batch: list[tuple[list, asyncio.Future]]) -> None:
+        flat = [x for items, _ in batch for x in items]
+        try:
+            results: list[Any] = await asyncio.to_thread(self.batch_fn, flat)
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(e)
+                return
+
+            # Retry one by one, so a bad request only fails itself
+            for request in batch:
+                await self.run_batch([request])
+            return
+
+        offset = 0
+        for items, future in batch:
+            if not future.done():
+                future.set_result(results[offset : offset + len(items)])
+            offset += len(items)
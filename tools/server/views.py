@@ -1,6 +1,6 @@
+import asyncio
 import io
 import os
-import re
 import shutil
 import tempfile
 import time
@@ -24,6 +24,7 @@ from kui.asgi import (
 from loguru import logger
 from typing_extensions import Annotated
 
+from fish_speech.inference_engine.reference_loader import ReferenceLoader
 from fish_speech.utils.schema import (
     AddReferenceRequest,
     AddReferenceResponse,
@@ -38,22 +39,41 @@ from fish_speech.utils.schema import (
 )
 from tools.server.api_utils import (
     buffer_to_async_generator,
+    encode_wav,
     format_response,
     get_content_type,
     inference_async,
 )
 from tools.server.inference import inference_wrapper as inference
 from tools.server.model_manager import ModelManager
-from tools.server.model_utils import (
-    batch_vqgan_decode,
-    cached_vqgan_batch_encode,
-)
+from tools.server.model_utils import cached_vqgan_batch_encode
 
 MAX_NUM_SAMPLES = int(os.getenv("NUM_SAMPLES", 1))
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 routes = Routes()
 
 
+def save_upload(audio: UploadFile, suffix: str = ".wav") -> tuple[str, int]:
+    """
+    Stream an uploaded file into a temporary file chunk by chunk,
+    so large uploads are never held in memory as a single bytes object.
+    Returns the temporary file path and the number of bytes written.
+    """
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        try:
+            while chunk := audio.read(UPLOAD_CHUNK_SIZE):
+                temp_file.write(chunk)
+                size += len(chunk)
+        except Exception:
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+
+    return temp_file.name, size
+
+
 @routes.http("/v1/health")
 class Health(HttpView):
     @classmethod
@@ -79,7 +99,7 @@ async def vqgan_encode(req: Annotated[ServeVQGANEncodeRequest, Body(exclusive=Tr
         start_time = time.time()
         tokens = cached_vqgan_batch_encode(decoder_model, req.audios)
         logger.info(
-            f"[EXEC] VQGAN encode time: {(time.time() - start_time) * 1000:.2f}ms"
+            "[EXEC] VQGAN encode time: {:.2f}ms", (time.time() - start_time) * 1000
         )
 
         # Return the response
@@ -102,14 +122,13 @@ async def vqgan_decode(req: Annotated[ServeVQGANDecodeRequest, Body(exclusive=Tr
     try:
         # Get the model from the app
         model_manager: ModelManager = request.app.state.model_manager
-        decoder_model = model_manager.decoder_model
 
-        # Decode the audio
+        # Decode the audio, batched with other concurrent decode requests
         tokens = [torch.tensor(token, dtype=torch.int) for token in req.tokens]
         start_time = time.time()
-        audios = batch_vqgan_decode(decoder_model, tokens)
+        audios = await model_manager.decode_batcher.submit(tokens)
         logger.info(
-            f"[EXEC] VQGAN decode time: {(time.time() - start_time) * 1000:.2f}ms"
+            "[EXEC] VQGAN decode time: {:.2f}ms", (time.time() - start_time) * 1000
         )
         audios = [audio.astype(np.float16).tobytes() for audio in audios]
 
@@ -162,16 +181,20 @@ async def tts(req: Annotated[ServeTTSRequest, Body(exclusive=True)]):
             )
         else:
             fake_audios = next(inference(req, engine))
-            buffer = io.BytesIO()
-            sf.write(
-                buffer,
-                fake_audios,
-                sample_rate,
-                format=req.format,
-            )
+            if req.format == "wav" and fake_audios.ndim == 1:
+                audio_bytes = encode_wav(fake_audios, sample_rate)
+            else:
+                buffer = io.BytesIO()
+                sf.write(
+                    buffer,
+                    fake_audios,
+                    sample_rate,
+                    format=req.format,
+                )
+                audio_bytes = buffer.getvalue()
 
             return StreamResponse(
-                iterable=buffer_to_async_generator(buffer.getvalue()),
+                iterable=buffer_to_async_generator(audio_bytes),
                 headers={
                     "Content-Disposition": f"attachment; filename=audio.{req.format}",
                 },
@@ -209,18 +232,13 @@ async def add_reference(
         model_manager: ModelManager = app_state.model_manager
         engine = model_manager.tts_inference_engine
 
-        # Read the uploaded audio file
-        audio_content = audio.read()
-        if not audio_content:
+        # Save the uploaded audio, off the event loop
+        temp_file_path, audio_size = await asyncio.to_thread(save_upload, audio)
+        if audio_size == 0:
             raise ValueError("Audio file is empty or could not be read")
 
-        # Create a temporary file for the audio data
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
-            temp_file.write(audio_content)
-            temp_file_path = temp_file.name
-
         # Add the reference using the engine's reference loader
-        engine.add_reference(id, temp_file_path, text)
+        await asyncio.to_thread(engine.add_reference, id, temp_file_path, text)
 
         response = AddReferenceResponse(
             success=True,
@@ -280,7 +298,7 @@ async def list_references():
         engine = model_manager.tts_inference_engine
 
         # Get the list of reference IDs
-        reference_ids = engine.list_reference_ids()
+        reference_ids = await asyncio.to_thread(engine.list_reference_ids)
 
         response = ListReferencesResponse(
             success=True,
@@ -313,7 +331,7 @@ async def delete_reference(reference_id: str = Body(...)):
         engine = model_manager.tts_inference_engine
 
         # Delete the reference using the engine's reference loader
-        engine.delete_reference(reference_id)
+        await asyncio.to_thread(engine.delete_reference, reference_id)
 
         response = DeleteReferenceResponse(
             success=True,
@@ -375,22 +393,17 @@ async def update_reference(
         if old_reference_id == new_reference_id:
             raise ValueError("New reference ID must be different from old reference ID")
 
-        # Validate ID format per ReferenceLoader rules
-        id_pattern = r"^[a-zA-Z0-9\-_ ]+$"
-        if not re.match(id_pattern, new_reference_id) or len(new_reference_id) > 255:
-            raise ValueError(
-                "New reference ID contains invalid characters or is too long"
-            )
+        # Validate ID format per ReferenceLoader rules,
+        # the old ID may be any existing folder inside references
+        ReferenceLoader.validate_reference_id(new_reference_id)
+        old_dir = ReferenceLoader.reference_dir(old_reference_id)
+        new_dir = Path("references") / new_reference_id
 
         # Access engine to update caches after renaming
         app_state = request.app.state
         model_manager: ModelManager = app_state.model_manager
         engine = model_manager.tts_inference_engine
 
-        refs_base = Path("references")
-        old_dir = refs_base / old_reference_id
-        new_dir = refs_base / new_reference_id
-
         # Existence checks
         if not old_dir.exists() or not old_dir.is_dir():
             raise FileNotFoundError(f"Reference ID '{old_reference_id}' not found")
@@ -410,6 +423,7 @@ async def update_reference(
         # Update in-memory cache key if present
         if old_reference_id in engine.ref_by_id:
             engine.ref_by_id[new_reference_id] = engine.ref_by_id.pop(old_reference_id)
+        engine.ref_ids = None
 
         response = UpdateReferenceResponse(
             success=True,
@@ -5,6 +5,9 @@ from typing import Any, Callable
 from fish_speech.i18n import i18n
 from fish_speech.utils.schema import ServeReferenceAudio, ServeTTSRequest
 
+# Validated once, the values below come from bounded Gradio components
+REQUEST_TEMPLATE = ServeTTSRequest(text="")
+
 
 def inference_wrapper(
     text,
@@ -30,17 +33,19 @@ def inference_wrapper(
     else:
         references = []
 
-    req = ServeTTSRequest(
-        text=text,
-        reference_id=reference_id if reference_id else None,
-        references=references,
-        max_new_tokens=max_new_tokens,
-        chunk_length=chunk_length,
-        top_p=top_p,
-        repetition_penalty=repetition_penalty,
-        temperature=temperature,
-        seed=int(seed) if seed else None,
-        use_memory_cache=use_memory_cache,
+    req = REQUEST_TEMPLATE.model_copy(
+        update=dict(
+            text=text,
+            reference_id=reference_id if reference_id else None,
+            references=references,
+            max_new_tokens=max_new_tokens,
+            chunk_length=chunk_length,
+            top_p=top_p,
+            repetition_penalty=repetition_penalty,
+            temperature=temperature,
+            seed=int(seed) if seed else None,
+            use_memory_cache=use_memory_cache,
+        )
     )
 
     for result in engine.inference(req):